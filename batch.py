@@ -0,0 +1,191 @@
+"""
+Пакетный запуск парсеров без Telegram.
+
+Файл запросов — по одному запросу на строку в формате `вакансия;город`
+(строки, начинающиеся с `#`, пропускаются). Для каждого запроса HH и
+Habr Career запускаются параллельно, резюме дописываются в отдельный
+JSONL-файл по мере получения. С --sharded каждый запрос обходится
+несколькими процессами-воркерами (services.crawl_service).
+
+    python batch.py queries.txt --out batch_output --concurrency 4
+    python batch.py queries.txt --sharded --workers 4 --hh-pages 100
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import re
+import time
+from pathlib import Path
+
+from scrapers.hh_scraper import HHParser
+from scrapers.habr_scraper import parse_habr_resumes
+from services.crawl_service import run_sharded_crawl
+
+
+def load_queries(path: Path):
+    queries = []
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            vacancy, _, city = line.partition(";")
+            queries.append((vacancy.strip(), city.strip()))
+    return queries
+
+
+def query_filename(index, vacancy, city):
+    slug = re.sub(r"[^\w]+", "_", f"{vacancy}_{city}").strip("_").lower()
+    return f"{index:04d}_{slug}.jsonl"
+
+
+class JsonlWriter:
+    """Дописывает резюме в JSONL-файл сразу после парсинга"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.count = 0
+        self._file = path.open("w", encoding="utf-8")
+
+    def write_sync(self, source, resume):
+        self._file.write(json.dumps({"source": source, **resume}, ensure_ascii=False))
+        self._file.write("\n")
+        self._file.flush()
+        self.count += 1
+
+    async def write(self, source, resume):
+        self.write_sync(source, resume)
+
+    def close(self):
+        self._file.close()
+
+
+async def run_query(index, vacancy, city, args, out_dir):
+    writer = JsonlWriter(out_dir / query_filename(index, vacancy, city))
+    started = time.perf_counter()
+
+    async def run_hh():
+        parser = HHParser(vacancy, city)
+        await parser.run(
+            max_pages=args.hh_pages,
+            limit_per_page=47 if args.limit is None else args.limit,
+            result_callback=lambda r: writer.write("hh", r),
+            headless=True,
+        )
+
+    async def run_habr():
+        await parse_habr_resumes(
+            query=vacancy,
+            max_pages=args.habr_pages,
+            prefetch=args.habr_prefetch,
+            result_callback=lambda r: writer.write("habr", r),
+        )
+
+    async def run_sharded():
+        await run_sharded_crawl(
+            vacancy,
+            city,
+            hh_pages=args.hh_pages,
+            habr_pages=args.habr_pages,
+            workers=args.workers,
+            limit=args.limit or None,
+            result_callback=writer.write_sync,
+        )
+
+    try:
+        if args.sharded:
+            sources = ("sharded",)
+            runs = [run_sharded()]
+        else:
+            sources = ("hh", "habr")
+            runs = [run_hh(), run_habr()]
+
+        outcomes = await asyncio.gather(*runs, return_exceptions=True)
+        for source, outcome in zip(sources, outcomes):
+            if isinstance(outcome, Exception):
+                print(f"❌ Ошибка {source} для «{vacancy}» ({city}): {outcome}")
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ «{vacancy}» ({city}): {writer.count} резюме за {elapsed:.1f} с")
+    return writer.count
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description="Пакетный парсинг резюме")
+    arg_parser.add_argument(
+        "queries", type=Path, help="файл с запросами вакансия;город"
+    )
+    arg_parser.add_argument("--out", type=Path, default=Path("batch_output"))
+    arg_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=2,
+        help="одновременно обрабатываемых запросов (у каждого свои браузеры HH и Habr)",
+    )
+    arg_parser.add_argument("--hh-pages", type=int, default=5)
+    arg_parser.add_argument("--habr-pages", type=int, default=3)
+    arg_parser.add_argument(
+        "--habr-prefetch",
+        type=int,
+        default=1,
+        help="страниц Habr, загружаемых заранее (0 — последовательно)",
+    )
+    arg_parser.add_argument(
+        "--limit",
+        type=int,
+        default=None,
+        help="лимит резюме HH: на страницу выдачи (по умолчанию 47), "
+        "с --sharded — на весь запрос (по умолчанию и при 0 — без лимита)",
+    )
+    arg_parser.add_argument(
+        "--sharded",
+        action="store_true",
+        help="раздавать страницы и резюме запроса нескольким процессам-воркерам",
+    )
+    arg_parser.add_argument(
+        "--workers", type=int, default=4, help="воркеров на запрос в режиме --sharded"
+    )
+    args = arg_parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    queries = load_queries(args.queries)
+    args.out.mkdir(parents=True, exist_ok=True)
+
+    # Запросы разбирают concurrency воркеров: файл результата открывается
+    # и таймер запускается, только когда запрос взят в работу
+    pending = asyncio.Queue()
+    for i, (vacancy, city) in enumerate(queries, start=1):
+        pending.put_nowait((i, vacancy, city))
+
+    counts = []
+
+    async def query_worker():
+        while not pending.empty():
+            i, vacancy, city = pending.get_nowait()
+            counts.append(await run_query(i, vacancy, city, args, args.out))
+
+    print(f"🔍 Запросов: {len(queries)}, параллельно: {args.concurrency}")
+    started = time.perf_counter()
+
+    await asyncio.gather(
+        *(query_worker() for _ in range(min(args.concurrency, len(queries))))
+    )
+
+    elapsed = time.perf_counter() - started
+    total = sum(counts)
+    print("\n📊 ИТОГО:")
+    print(f"   Запросов: {len(queries)}")
+    print(f"   Резюме: {total}")
+    print(f"   Время: {elapsed:.1f} с")
+    if elapsed > 0:
+        print(f"   Скорость: {total / elapsed:.2f} резюме/с")
+        print(f"   Запросов в минуту: {len(queries) / elapsed * 60:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""
+Бенчмарк ранжирования на синтетической выборке.
+
+    python -m benchmarks.bench_ranking --resumes 100000 --top-k 100
+"""
+
+import argparse
+import random
+import time
+
+from services.ranking import bm25_scores, rank_resumes
+
+TITLES = [
+    "Python разработчик",
+    "Backend developer",
+    "Frontend разработчик",
+    "Аналитик данных",
+    "Java разработчик",
+    "DevOps инженер",
+    "Тестировщик",
+    "Менеджер проектов",
+]
+SKILLS = [
+    "Python", "Django", "FastAPI", "PostgreSQL", "Docker", "Kubernetes",
+    "JavaScript", "React", "TypeScript", "Java", "Spring", "SQL", "Excel",
+    "Git", "Linux", "Pandas", "Airflow", "Kafka", "Redis", "Figma",
+]
+NORMALIZED = [s.lower() for s in SKILLS]
+WORDS = (
+    "разработка сервисов поддержка проекта команда задачи внедрение "
+    "оптимизация интеграция api база данных архитектура тестирование"
+).split()
+
+
+def make_resume(i, rng):
+    skills = rng.sample(SKILLS, 5)
+    experience = " ".join(rng.choice(WORDS) for _ in range(60))
+    if i % 4 == 0:
+        # Карточка Habr Career
+        return {
+            "directions": [rng.choice(TITLES)],
+            "skills": skills,
+            "skills_normalized": [s.lower() for s in skills],
+            "work_experience": [experience],
+        }
+    return {
+        "title": rng.choice(TITLES),
+        "blocks": {
+            "skills": {"list": skills},
+            "experience": {"raw": experience},
+        },
+        "skills_normalized": [s.lower() for s in skills],
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Бенчмарк ранжирования")
+    arg_parser.add_argument("--resumes", type=int, default=100_000)
+    arg_parser.add_argument("--top-k", type=int, default=100)
+    arg_parser.add_argument("--query", default="python разработчик django")
+    args = arg_parser.parse_args()
+
+    rng = random.Random(42)
+    resumes = [make_resume(i, rng) for i in range(args.resumes)]
+
+    started = time.perf_counter()
+    scores = bm25_scores(args.query, resumes)
+    scoring = time.perf_counter() - started
+
+    started = time.perf_counter()
+    ranked = rank_resumes(args.query, resumes, top_k=args.top_k)
+    ranking = time.perf_counter() - started
+
+    print(f"Резюме: {len(resumes)}, запрос: «{args.query}»")
+    print(f"   bm25_scores: {scoring:.2f} с ({len(resumes) / scoring:,.0f} резюме/с)")
+    print(f"   rank_resumes (top-{args.top_k}): {ranking:.2f} с")
+    print(f"   Ненулевых оценок: {int((scores > 0).sum())}")
+    print(f"   Лучшее резюме: {ranked[0].get('title') or ranked[0]['directions']}")
+
+
+if __name__ == "__main__":
+    main()
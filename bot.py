@@ -3,6 +3,8 @@ import logging
 import os
 from aiogram import Bot, Dispatcher
 from handlers.form import router as form_router
+from services.scrape_worker import ScrapeWorkerPool
+from config import SCRAPE_WORKERS, SCRAPE_JOBS_PER_WORKER, SCRAPE_JOB_TIMEOUT
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,7 +18,19 @@ async def main():
     # Регистрация роутеров
     dp.include_router(form_router)
 
-    await dp.start_polling(bot)
+    # Парсинг выполняется в отдельных процессах, бот только отправляет задачи
+    scrape_pool = ScrapeWorkerPool(
+        workers=SCRAPE_WORKERS,
+        max_jobs_per_worker=SCRAPE_JOBS_PER_WORKER,
+        job_timeout=SCRAPE_JOB_TIMEOUT,
+    )
+    await scrape_pool.start()
+    dp["scrape_pool"] = scrape_pool
+
+    try:
+        await dp.start_polling(bot)
+    finally:
+        await scrape_pool.stop()
 
 
 if __name__ == "__main__":
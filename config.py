@@ -13,6 +13,18 @@ if not BOT_TOKEN:
 if not EXTERNAL_URL:
     raise ValueError("EXTERNAL_URL не найден в .env")
 
+# Воркеры парсинга
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", "3"))
+SCRAPE_JOBS_PER_WORKER = int(os.getenv("SCRAPE_JOBS_PER_WORKER", "20"))
+# Сколько секунд воркер может держать одну задачу, прежде чем его убьют (0 — без ограничения)
+SCRAPE_JOB_TIMEOUT = int(os.getenv("SCRAPE_JOB_TIMEOUT", "900")) or None
+
+# Сколько лучших резюме отправлять на EXTERNAL_URL (0 — все)
+RESULTS_TOP_K = int(os.getenv("RESULTS_TOP_K", "0")) or None
+
+# Бюджет времени на один поиск в секундах (0 — без ограничения)
+SEARCH_TIME_BUDGET = int(os.getenv("SEARCH_TIME_BUDGET", "600")) or None
+
 # Константы путей
 TRACK_FILE = Path("time.json")
 RESUME_FILE = Path("resume.json")
@@ -14,9 +14,14 @@ from aiogram.fsm.context import FSMContext
 
 from states.form import VacancyForm, TrackForm
 from utils.typing import send_typing
-from services.hh_service import run_hh_parser
-from scrapers.habr_scraper import parse_habr_resumes
-from config import TRACK_FILE, RESUME_FILE, EXTERNAL_URL
+from services.scrape_worker import ScrapeWorkerPool
+from config import (
+    TRACK_FILE,
+    RESUME_FILE,
+    EXTERNAL_URL,
+    RESULTS_TOP_K,
+    SEARCH_TIME_BUDGET,
+)
 
 router = Router()
 
@@ -179,7 +184,9 @@ async def get_vacancy(message: Message, state: FSMContext):
 
 
 @router.message(VacancyForm.city)
-async def get_city(message: Message, state: FSMContext, bot: Bot):
+async def get_city(
+    message: Message, state: FSMContext, bot: Bot, scrape_pool: ScrapeWorkerPool
+):
     data = await state.get_data()
     vacancy, city = data["vacancy"], message.text
     progress_msg = await message.answer(
@@ -199,29 +206,33 @@ async def get_city(message: Message, state: FSMContext, bot: Bot):
             except Exception:
                 pass
 
-    async def background_search():
+    async def queue_callback(position):
         try:
-            # 1. Запуск основного парсера (HH)
-            count, results = await run_hh_parser(
-                vacancy, city, progress_callback=progress_callback
+            await bot.edit_message_text(
+                chat_id=progress_msg.chat.id,
+                message_id=progress_msg.message_id,
+                text=f"🔎 Поиск «{vacancy}» в «{city}»...\n🕒 В очереди: {position}",
             )
+        except TelegramBadRequest:
+            pass
+        except Exception:
+            pass
 
-            # 2. Условие: если результатов меньше 47, добираем из Хабра
-            if count < 47:
-                # Можно добавить принт для логов (пользователь не увидит)
-                print(f"Мало данных ({count}), запускаем парсинг Habr...")
-
-                # Запускаем ваш парсер Habr Career
-                # Передаем vacancy как query. max_pages можно настроить
-                habr_results = await parse_habr_resumes(query=vacancy, max_pages=3)
-
-                if habr_results:
-                    # Объединяем списки
-                    results.extend(habr_results)
-                    # Обновляем общее количество для отчета
-                    count = len(results)
+    async def background_search():
+        try:
+            # 1. Поиск HH + Habr выполняется в процессе-воркере,
+            # результаты приходят отсортированными по релевантности.
+            # Если бюджет времени исчерпан, partial=True
+            count, results, partial = await scrape_pool.submit(
+                vacancy,
+                city,
+                progress_callback=progress_callback,
+                queue_callback=queue_callback,
+                top_k=RESULTS_TOP_K,
+                time_budget=SEARCH_TIME_BUDGET,
+            )
 
-            # 3. Сохранение ОБЪЕДИНЕННОГО списка в один JSON
+            # 2. Сохранение ОБЪЕДИНЕННОГО списка в один JSON
             with open(RESUME_FILE, "w", encoding="utf-8") as f:
                 json.dump(results, f, ensure_ascii=False, indent=4)
 
@@ -229,14 +240,23 @@ async def get_city(message: Message, state: FSMContext, bot: Bot):
 
             # Отправка полных данных на внешний URL
             await send_data_to_url(
-                {"vacancy": vacancy, "city": city, "count": count, "results": results}
+                {
+                    "vacancy": vacancy,
+                    "city": city,
+                    "count": count,
+                    "partial": partial,
+                    "results": results,
+                }
             )
 
             # Сообщение пользователю (просто общее число)
+            text = f"✅ Поиск «{vacancy}» завершен!\nНайдено резюме: {count}\nДанные отправлены."
+            if partial:
+                text += "\n⏱ Время поиска истекло — результаты неполные."
             await bot.edit_message_text(
                 chat_id=progress_msg.chat.id,
                 message_id=progress_msg.message_id,
-                text=f"✅ Поиск «{vacancy}» завершен!\nНайдено резюме: {count}\nДанные отправлены.",
+                text=text,
             )
 
         except Exception as e:
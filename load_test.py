@@ -0,0 +1,340 @@
+"""
+Нагрузочный тест хендлеров бота.
+
+Роутер `handlers.form` подключается к настоящему Dispatcher, но вместо
+Telegram используется фейковая сессия Bot, а вместо парсеров — заглушка
+пула воркеров с настраиваемой длительностью поиска и размером результата;
+как и настоящий пул, заглушка выполняет не больше --workers поисков сразу.
+Сотни пользователей одновременно проходят сценарии поиска и отслеживания,
+в конце выводятся перцентили задержки хендлеров, задержка event loop
+и память.
+
+    python load_test.py --users 300 --workers 3 --scrape-duration 5 --results 47
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import shutil
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# handlers.form импортирует config, который требует эти переменные
+os.environ.setdefault("BOT_TOKEN", "123456789:LOAD-TEST-TOKEN")
+os.environ.setdefault("EXTERNAL_URL", "http://localhost/load-test")
+
+from aiogram import BaseMiddleware, Bot, Dispatcher
+from aiogram.client.session.base import BaseSession
+from aiogram.types import Chat, Message, Update
+
+import handlers.form as form
+from config import SCRAPE_WORKERS
+from handlers.form import router as form_router
+
+SEARCH_FLOW = ["/start", "🔍 Начать новый поиск", "python разработчик", "Москва"]
+TRACKING_FLOW = [
+    "/start",
+    "📡 Отслеживать",
+    "➕ Добавить",
+    "python разработчик",
+    "Москва",
+    "📋 Список",
+    "🗑️ Удалить",
+    "1",
+    "⬅️ Назад",
+]
+
+
+class FakeSession(BaseSession):
+    """Сессия Bot без сети: отвечает на любой метод API с заданной задержкой"""
+
+    def __init__(self, latency=0.0):
+        super().__init__()
+        self.latency = latency
+        self.calls = 0
+        self._message_ids = itertools.count(1)
+
+    async def make_request(self, bot, method, timeout=None):
+        self.calls += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if method.__returning__ is Message:
+            return Message(
+                message_id=next(self._message_ids),
+                date=datetime.now(),
+                chat=Chat(id=method.chat_id, type="private"),
+                text=getattr(method, "text", None),
+            )
+        return True
+
+    async def stream_content(
+        self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True
+    ):
+        yield b""
+
+    async def close(self):
+        pass
+
+
+class StubScrapePool:
+    """
+    Заглушка ScrapeWorkerPool: имитирует поиск вместо запуска браузера.
+    Как и настоящий пул, выполняет не больше workers поисков одновременно,
+    остальные ждут в очереди.
+    """
+
+    def __init__(self, duration, jitter, results, text_size, workers):
+        self.duration = duration
+        self.jitter = jitter
+        self.results = results
+        self.text_size = text_size
+        self.completed = 0
+        self.queued = 0
+        self.max_queued = 0
+        self._slots = asyncio.Semaphore(workers)
+
+    def _make_resume(self, i, vacancy, city):
+        return {
+            "url": f"https://hh.ru/resume/{i}",
+            "title": vacancy,
+            "city": city,
+            "contacts": {"emails": [f"user{i}@example.com"], "telegrams": []},
+            "external_links": [],
+            "blocks": {"skills": {"list": ["Python", "SQL", "Docker"]}},
+            "full_text": "x" * self.text_size,
+        }
+
+    async def submit(
+        self, vacancy, city, progress_callback=None, queue_callback=None, **options
+    ):
+        if self._slots.locked():
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+            if queue_callback:
+                await queue_callback(self.queued)
+            async with self._slots:
+                self.queued -= 1
+                return await self._search(vacancy, city, progress_callback)
+
+        async with self._slots:
+            return await self._search(vacancy, city, progress_callback)
+
+    async def _search(self, vacancy, city, progress_callback):
+        duration = max(0.0, random.uniform(-self.jitter, self.jitter) + self.duration)
+        step = duration / max(self.results, 1)
+
+        results = []
+        for i in range(1, self.results + 1):
+            await asyncio.sleep(step)
+            results.append(self._make_resume(i, vacancy, city))
+            if progress_callback:
+                await progress_callback(min(int(i / self.results * 100), 100))
+
+        self.completed += 1
+        return len(results), results, False
+
+
+class LatencyMiddleware(BaseMiddleware):
+    """Замеряет время выполнения каждого хендлера"""
+
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    async def __call__(self, handler, event, data):
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        finally:
+            name = data["handler"].callback.__name__
+            self.samples[name].append(time.perf_counter() - started)
+
+
+async def monitor_loop_lag(samples, interval=0.01):
+    """Насколько позже запланированного просыпается корутина"""
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        samples.append(loop.time() - started - interval)
+
+
+def percentile(samples, p):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def make_update(bot, update_id, user_id, text):
+    return Update.model_validate(
+        {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": user_id, "type": "private"},
+                "from": {"id": user_id, "is_bot": False, "first_name": "Load"},
+                "text": text,
+            },
+        },
+        context={"bot": bot},
+    )
+
+
+async def simulate_user(dp, bot, user_id, flow, think, update_ids):
+    for text in flow:
+        await asyncio.sleep(random.uniform(0, think))
+        await dp.feed_update(bot, make_update(bot, next(update_ids), user_id, text))
+
+
+def print_row(name, samples):
+    print(
+        f"   {name:<24} {len(samples):>6} "
+        f"{percentile(samples, 50) * 1000:>9.2f} "
+        f"{percentile(samples, 95) * 1000:>9.2f} "
+        f"{percentile(samples, 99) * 1000:>9.2f} "
+        f"{max(samples, default=0) * 1000:>9.2f}"
+    )
+
+
+async def run_load_test(args):
+    async def send_data_to_url(data):
+        pass
+
+    form.send_data_to_url = send_data_to_url
+
+    session = FakeSession(latency=args.api_latency)
+    bot = Bot(token=os.environ["BOT_TOKEN"], session=session)
+    dp = Dispatcher()
+    dp.include_router(form_router)
+
+    latency = LatencyMiddleware()
+    dp.message.middleware(latency)
+
+    pool = StubScrapePool(
+        args.scrape_duration,
+        args.scrape_jitter,
+        args.results,
+        args.text_size,
+        args.workers,
+    )
+    dp["scrape_pool"] = pool
+
+    lag_samples = []
+    lag_task = asyncio.create_task(monitor_loop_lag(lag_samples))
+
+    update_ids = itertools.count(1)
+    searches = int(args.users * args.search_share)
+    users = [
+        simulate_user(
+            dp,
+            bot,
+            user_id,
+            SEARCH_FLOW if user_id <= searches else TRACKING_FLOW,
+            args.think,
+            update_ids,
+        )
+        for user_id in range(1, args.users + 1)
+    ]
+
+    print(f"👥 Пользователей: {args.users}, из них с поиском: {searches}")
+    started = time.perf_counter()
+    await asyncio.gather(*users)
+
+    # Дожидаемся фоновых поисков, запущенных хендлером get_city
+    current = asyncio.current_task()
+    background = [t for t in asyncio.all_tasks() if t not in (current, lag_task)]
+    await asyncio.gather(*background, return_exceptions=True)
+    elapsed = time.perf_counter() - started
+
+    lag_task.cancel()
+
+    all_samples = [s for samples in latency.samples.values() for s in samples]
+    print("\n📊 Задержка хендлеров, мс:")
+    print(
+        f"   {'хендлер':<24} {'вызовов':>6} "
+        f"{'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+    )
+    for name, samples in sorted(latency.samples.items()):
+        print_row(name, samples)
+    print_row("ВСЕ", all_samples)
+
+    print("\n⏱ Задержка event loop, мс:")
+    print(f"   p50: {percentile(lag_samples, 50) * 1000:.2f}")
+    print(f"   p99: {percentile(lag_samples, 99) * 1000:.2f}")
+    print(f"   max: {max(lag_samples, default=0) * 1000:.2f}")
+
+    print("\n💾 Память:")
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        print(f"   Пиковый RSS: {max_rss / 1024:.1f} МБ")
+    if args.tracemalloc:
+        current_mem, peak_mem = tracemalloc.get_traced_memory()
+        print(f"   Python сейчас: {current_mem / 1024 / 1024:.1f} МБ")
+        print(f"   Python пик: {peak_mem / 1024 / 1024:.1f} МБ")
+
+    print("\n📈 Итого:")
+    print(f"   Время: {elapsed:.1f} с")
+    print(f"   Поисков завершено: {pool.completed}/{searches}")
+    print(f"   Максимум в очереди поиска: {pool.max_queued} (воркеров: {args.workers})")
+    print(f"   Вызовов Telegram API: {session.calls}")
+
+    await bot.session.close()
+
+
+async def main():
+    arg_parser = argparse.ArgumentParser(description="Нагрузочный тест хендлеров")
+    arg_parser.add_argument("--users", type=int, default=200)
+    arg_parser.add_argument(
+        "--search-share", type=float, default=0.5, help="доля пользователей с поиском"
+    )
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=SCRAPE_WORKERS,
+        help="одновременных поисков, как SCRAPE_WORKERS у бота",
+    )
+    arg_parser.add_argument("--scrape-duration", type=float, default=5.0)
+    arg_parser.add_argument("--scrape-jitter", type=float, default=1.0)
+    arg_parser.add_argument("--results", type=int, default=47)
+    arg_parser.add_argument("--text-size", type=int, default=4000)
+    arg_parser.add_argument(
+        "--think", type=float, default=0.5, help="пауза между сообщениями, с"
+    )
+    arg_parser.add_argument(
+        "--api-latency", type=float, default=0.05, help="задержка Telegram API, с"
+    )
+    arg_parser.add_argument(
+        "--tracemalloc", action="store_true", help="замерять пик памяти Python"
+    )
+    args = arg_parser.parse_args()
+
+    if args.tracemalloc:
+        tracemalloc.start()
+
+    # Файлы бота пишем во временную папку, отправку на EXTERNAL_URL глушим
+    workdir = Path(tempfile.mkdtemp(prefix="load_test_"))
+    form.TRACK_FILE = workdir / "time.json"
+    form.RESUME_FILE = workdir / "resume.json"
+
+    try:
+        await run_load_test(args)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,10 @@
 import asyncio
 import json
+from collections import deque
 from playwright.async_api import async_playwright
 from typing import Dict, List, Optional, Any
+from utils.skills import extract_skills
+from utils.deadline import DeadlineExceeded, run_within
 
 
 async def parse_header_data(card):
@@ -192,85 +195,182 @@ async def parse_experience_section(section):
     return experience_items
 
 
-async def parse_habr_resumes(query, max_pages=2):
-    """Основной парсер Habr Career"""
+def habr_page_url(query, page_num):
+    return f"https://career.habr.com/resumes?q={query}&page={page_num}"
+
+
+async def load_habr_page(page, query, page_num):
+    """Загружает страницу выдачи Habr Career и ждёт её отрисовки"""
+    print(f"📄 Загружаю страницу {page_num}: {query}")
+
+    await page.goto(habr_page_url(query, page_num))
+    await page.wait_for_load_state("networkidle")
+    await asyncio.sleep(2)
+
+
+def print_resume_data(i, card_data):
+    """Выводит данные карточки в консоль"""
+    if card_data["full_name"]:
+        directions_str = ", ".join(card_data["directions"])
+        salary_str = card_data["salary"] or "Зарплата не указана"
+        skills_str = ", ".join(card_data["skills"])
+        age_str = card_data["age"] or "Возраст не указан"
+        exp_items = ", ".join(card_data["work_experience"]) or "Опыт не указан"
+        city_str = card_data["city"] or "Город не указан"
+        profile_url = card_data["profile_url"]
+
+        print(f"   {i}. {card_data['full_name']}")
+        print(f"      Направления: {directions_str}")
+        print(f"      Зарплата: {salary_str}")
+        print(f"      Навыки: {skills_str}")
+        print(f"      Возраст: {age_str}")
+        print(f"      Опыт работы: {exp_items}")
+        print(f"      Город: {city_str}")
+        print(f"      Профиль: {profile_url}\n")
+
+    else:
+        print(f"   ⚠️  {i}. Имя не найдено")
+
+
+async def extract_habr_page(page, query, page_num):
+    """Парсит карточки с загруженной страницы.
+
+    Возвращает (список резюме, есть ли следующая страница).
+    """
+    results = []
+
+    # Поиск карточек резюме
+    cards = await page.query_selector_all(".base-section")
+    print(f"   Найдено .base-section элементов: {len(cards)}")
+
+    # Пропуска первого .base-section с ненужной информацией
+    start_index = 1 if len(cards) > 1 else 0
+
+    for i, card in enumerate(cards[start_index:], start=1):
+        # Парсинг данных карточки
+        card_data = await parse_header_data(card)
+
+        # Сбор данных в структурированном виде
+        resume_data = {
+            "query": query,
+            "source_page": page_num,
+            "card_index": i,
+            "full_name": card_data["full_name"],
+            "directions": card_data["directions"],
+            "salary": card_data["salary"],
+            "skills": card_data["skills"],
+            "skills_normalized": sorted(
+                extract_skills(*card_data["directions"], *card_data["skills"])
+            ),
+            "age": card_data["age"],
+            "city": card_data["city"],
+            "work_experience": card_data["work_experience"],
+            "profile_url": card_data["profile_url"],
+        }
+
+        results.append(resume_data)
+
+        # Вывод информации
+        print_resume_data(i, card_data)
+
+    print(f"   📊 Обработано на странице: {len(cards) - start_index} резюме")
+
+    # Проверка следующей страницы
+    next_button = await page.query_selector("a.next_page")
+    return results, next_button is not None
+
+
+async def parse_habr_pages_pipelined(
+    browser, query, max_pages, prefetch, handle_page, deadline=None
+):
+    """
+    Конвейерный обход выдачи: пока текущая страница разбирается,
+    следующие `prefetch` страниц уже загружаются в отдельных вкладках.
+    """
+    tab_count = min(prefetch + 1, max_pages)
+    tabs = deque([await browser.new_page() for _ in range(tab_count)])
+    in_flight = deque()
+    next_num = 1
+
+    def schedule():
+        nonlocal next_num
+        while tabs and next_num <= max_pages:
+            tab = tabs.popleft()
+            load = asyncio.create_task(load_habr_page(tab, query, next_num))
+            in_flight.append((next_num, tab, load))
+            next_num += 1
+
+    try:
+        schedule()
+        while in_flight:
+            page_num, tab, load = in_flight.popleft()
+            await run_within(deadline, load)
+
+            page_results, has_next = await run_within(
+                deadline, extract_habr_page(tab, query, page_num)
+            )
+            await handle_page(page_results)
+
+            if not has_next:
+                break
+
+            # Вкладка освободилась — ставим в загрузку следующую страницу
+            tabs.append(tab)
+            schedule()
+
+    finally:
+        # Страниц больше нет: отменяем загрузки, которые ещё идут
+        for _, _, load in in_flight:
+            load.cancel()
+        await asyncio.gather(
+            *(load for _, _, load in in_flight), return_exceptions=True
+        )
+
+
+async def parse_habr_resumes(
+    query, max_pages=2, result_callback=None, prefetch=0, deadline=None
+):
+    """Основной парсер Habr Career.
+
+    prefetch > 0 включает конвейерный режим: столько страниц загружается
+    заранее, пока разбирается текущая. По истечении deadline возвращаются
+    резюме с уже разобранных страниц.
+    """
     results = []
 
+    async def handle_page(page_results):
+        results.extend(page_results)
+
+        if result_callback:
+            for resume_data in page_results:
+                await result_callback(resume_data)
+
     async with async_playwright() as p:
         browser = await p.chromium.launch(headless=True)
-        page = await browser.new_page()
 
         try:
-            for page_num in range(1, max_pages + 1):
-                url = f"https://career.habr.com/resumes?q={query}&page={page_num}"
-                print(f"📄 Загружаю страницу {page_num}: {query}")
-
-                await page.goto(url)
-                await page.wait_for_load_state("networkidle")
-                await asyncio.sleep(2)
-
-                # Поиск карточек резюме
-                cards = await page.query_selector_all(".base-section")
-                print(f"   Найдено .base-section элементов: {len(cards)}")
-
-                # Пропуска первого .base-section с ненужной информацией
-                start_index = 1 if len(cards) > 1 else 0
-
-                for i, card in enumerate(cards[start_index:], start=1):
-                    # Парсинг данных карточки
-                    card_data = await parse_header_data(card)
-
-                    # Сбор данных в структурированном виде
-                    resume_data = {
-                        "query": query,
-                        "source_page": page_num,
-                        "card_index": i,
-                        "full_name": card_data["full_name"],
-                        "directions": card_data["directions"],
-                        "salary": card_data["salary"],
-                        "skills": card_data["skills"],
-                        "age": card_data["age"],
-                        "city": card_data["city"],
-                        "work_experience": card_data["work_experience"],
-                        "profile_url": card_data["profile_url"],
-                    }
-
-                    results.append(resume_data)
-
-                    # Вывод информации
-                    if card_data["full_name"]:
-                        directions_str = ", ".join(card_data["directions"])
-                        salary_str = card_data["salary"] or "Зарплата не указана"
-                        skills_str = ", ".join(card_data["skills"])
-                        age_str = card_data["age"] or "Возраст не указан"
-                        exp_items = (
-                            ", ".join(card_data["work_experience"]) or "Опыт не указан"
-                        )
-                        city_str = card_data["city"] or "Город не указан"
-                        profile_url = card_data["profile_url"]
-
-                        print(f"   {i}. {card_data['full_name']}")
-                        print(f"      Направления: {directions_str}")
-                        print(f"      Зарплата: {salary_str}")
-                        print(f"      Навыки: {skills_str}")
-                        print(f"      Возраст: {age_str}")
-                        print(f"      Опыт работы: {exp_items}")
-                        print(f"      Город: {city_str}")
-                        print(f"      Профиль: {profile_url}\n")
-
-                    else:
-                        print(f"   ⚠️  {i}. Имя не найдено")
-
-                print(
-                    f"   📊 Обработано на странице: {len(cards) - start_index} резюме"
+            if prefetch > 0:
+                await parse_habr_pages_pipelined(
+                    browser, query, max_pages, prefetch, handle_page, deadline
                 )
+            else:
+                page = await browser.new_page()
+
+                for page_num in range(1, max_pages + 1):
+                    await run_within(deadline, load_habr_page(page, query, page_num))
+
+                    page_results, has_next = await run_within(
+                        deadline, extract_habr_page(page, query, page_num)
+                    )
+                    await handle_page(page_results)
+
+                    if not has_next:
+                        break
 
-                # Проверка следующей страницы
-                next_button = await page.query_selector("a.next_page")
-                if not next_button:
-                    break
+                    await asyncio.sleep(1)
 
-                await asyncio.sleep(1)
+        except DeadlineExceeded:
+            print(f"⏱ Время поиска Habr истекло, собрано резюме: {len(results)}")
 
         except Exception as e:
             print(f" Ошибка: {e}")
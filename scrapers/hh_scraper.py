@@ -5,6 +5,8 @@ import json
 import aiohttp
 from pathlib import Path
 from playwright.async_api import async_playwright
+from utils.skills import extract_skills, extract_text_skills, get_skill_matcher
+from utils.deadline import DeadlineExceeded, run_within
 
 
 class HHParser:
@@ -12,6 +14,9 @@ class HHParser:
         self.specialty = specialty
         self.city_name = city_name
         self.area_id = "1"
+        # Навыки из запроса сверяются по таксономии, остальные слова — как есть
+        self.query_skills, self.query_words = get_skill_matcher().split(specialty)
+        self.deadline = None
         self.results = []
 
     async def _resolve_area_id(self):
@@ -32,71 +37,130 @@ class HHParser:
 
         self.area_id = find_city(areas) or "1"
 
-    async def run(self, max_pages=5, limit_per_page=47, progress_callback=None):
-        await self._resolve_area_id()
-
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=False)
-            context = await browser.new_context()
-            page = await context.new_page()
+    def _search_url(self):
+        return (
+            f"https://{self.city_name.lower()}.hh.ru/search/resume?"
+            f"text={self.specialty}&pos=full_text&logic=normal&exp_period=all_time&ored_clusters=true&order_by=relevance&search_period=0"
+        )
 
-            search_url = (
-                f"https://{self.city_name.lower()}.hh.ru/search/resume?"
-                f"text={self.specialty}&pos=full_text&logic=normal&exp_period=all_time&ored_clusters=true&order_by=relevance&search_period=0"
+    async def _collect_links(self, page, pnum):
+        """Ссылки на резюме со страницы выдачи. None — если страниц больше нет."""
+        await run_within(self.deadline, page.goto(f"{self._search_url()}&page={pnum}"))
+        try:
+            await run_within(
+                self.deadline,
+                page.wait_for_selector(
+                    '[data-qa="serp-item__title"]', timeout=self._timeout_ms(10000)
+                ),
             )
+        except DeadlineExceeded:
+            raise
+        except Exception:
+            return None
 
-            for pnum in range(max_pages):
-                await page.goto(f"{search_url}&page={pnum}")
+        links = await page.locator('[data-qa="serp-item__title"]').evaluate_all(
+            "els => els.map(e => e.href)"
+        )
+        titles = await page.locator('[data-qa="serp-item__title"]').all_inner_texts()
+
+        return [
+            link for link, title in zip(links, titles) if self._title_matches(title)
+        ]
+
+    def _title_matches(self, title):
+        """
+        Фильтр по вакансии: навыки из запроса должны найтись в заголовке
+        (с учётом синонимов), остальные слова запроса — буквально
+        """
+        if self.query_skills and not self.query_skills <= extract_skills(title):
+            return False
+
+        title = title.lower()
+        return all(word in title for word in self.query_words)
+
+    def _timeout_ms(self, default_ms):
+        """Таймаут Playwright, укороченный до остатка бюджета времени"""
+        if self.deadline is None:
+            return default_ms
+        return self.deadline.timeout_ms(default_ms)
+
+    async def _visit_resume(self, page, link):
+        return await run_within(self.deadline, self._load_resume(page, link))
+
+    async def _load_resume(self, page, link):
+        await page.goto(
+            link, timeout=self._timeout_ms(60000), wait_until="domcontentloaded"
+        )
+        await asyncio.sleep(random.uniform(1.5, 3))
+        return await self._parse_resume(page, link)
+
+    async def run(
+        self,
+        max_pages=5,
+        limit_per_page=47,
+        progress_callback=None,
+        result_callback=None,
+        headless=False,
+        deadline=None,
+    ):
+        self.deadline = deadline
+
+        try:
+            await run_within(deadline, self._resolve_area_id())
+
+            async with async_playwright() as p:
+                browser = await p.chromium.launch(headless=headless)
                 try:
-                    await page.wait_for_selector(
-                        '[data-qa="serp-item__title"]', timeout=10000
+                    context = await browser.new_context()
+                    page = await context.new_page()
+                    await self._crawl(
+                        page,
+                        max_pages,
+                        limit_per_page,
+                        progress_callback,
+                        result_callback,
                     )
-                except:
-                    break  # Если страниц больше нет
-
-                links = await page.locator('[data-qa="serp-item__title"]').evaluate_all(
-                    "els => els.map(e => e.href)"
-                )
-                titles = await page.locator(
-                    '[data-qa="serp-item__title"]'
-                ).all_inner_texts()
-
-                # Фильтруем по вакансии
-                keywords = [w.lower() for w in self.specialty.split()]
-                filtered_links = [
-                    link
-                    for link, title in zip(links, titles)
-                    if all(word in title.lower() for word in keywords)
-                ]
-
-                for link in filtered_links:
-                    try:
-                        await page.goto(
-                            link, timeout=60000, wait_until="domcontentloaded"
-                        )
-                        await asyncio.sleep(random.uniform(1.5, 3))
-
-                        resume = await self._parse_resume(page, link)
-                        self.results.append(resume)
-
-                        if progress_callback:
-                            percent = int(len(self.results) / limit_per_page * 100)
-                            await progress_callback(min(percent, 100))
-
-                        if len(self.results) >= limit_per_page:
-                            break
-                    except Exception as e:
-                        print(f"❌ Ошибка загрузки резюме {link}: {e}")
-                        continue
-
-                if len(self.results) >= limit_per_page:
-                    break
-
-            await browser.close()
+                finally:
+                    # Закрытие браузера обрывает навигации, которые ещё идут
+                    await browser.close()
+
+        except DeadlineExceeded:
+            print(f"⏱ Время поиска HH истекло, собрано резюме: {len(self.results)}")
 
         # Возвращаем количество и сами данные
         return len(self.results), self.results
 
+    async def _crawl(
+        self, page, max_pages, limit_per_page, progress_callback, result_callback
+    ):
+        for pnum in range(max_pages):
+            filtered_links = await self._collect_links(page, pnum)
+            if filtered_links is None:
+                break  # Если страниц больше нет
+
+            for link in filtered_links:
+                try:
+                    resume = await self._visit_resume(page, link)
+                    self.results.append(resume)
+
+                    if result_callback:
+                        await result_callback(resume)
+
+                    if progress_callback:
+                        percent = int(len(self.results) / limit_per_page * 100)
+                        await progress_callback(min(percent, 100))
+
+                    if len(self.results) >= limit_per_page:
+                        break
+                except DeadlineExceeded:
+                    raise
+                except Exception as e:
+                    print(f"❌ Ошибка загрузки резюме {link}: {e}")
+                    continue
+
+            if len(self.results) >= limit_per_page:
+                break
+
     async def _parse_resume(self, page, link):
         full_text = await page.locator(".resume-wrapper").inner_text()
 
@@ -118,11 +182,11 @@ class HHParser:
         )
         tgs = re.findall(r"(?:@|t\.me\/)([a-zA-Z0-9_]{5,})", full_text)
 
+        title = await self._get_text(page, '[data-qa="resume-block-title-position"]')
+
         return {
             "url": link,
-            "title": await self._get_text(
-                page, '[data-qa="resume-block-title-position"]'
-            ),
+            "title": title,
             "city": self.city_name,
             "contacts": {
                 "emails": list(set(emails)),
@@ -130,9 +194,18 @@ class HHParser:
             },
             "external_links": await self._get_links(page),
             "blocks": self._normalize_blocks(blocks),
+            "skills_normalized": sorted(
+                extract_skills(title, self._skills_block(blocks))
+                | extract_text_skills(full_text)
+            ),
             "full_text": full_text,
         }
 
+    def _skills_block(self, blocks: dict):
+        return "\n".join(
+            text for title, text in blocks.items() if "навык" in title.lower()
+        )
+
     def _normalize_blocks(self, blocks: dict):
         normalized = {}
         for title, text in blocks.items():
@@ -154,7 +227,7 @@ class HHParser:
     async def _get_text(self, page, selector):
         try:
             return await page.locator(selector).inner_text()
-        except:
+        except Exception:
             return "Не указано"
 
     async def _get_links(self, page):
@@ -0,0 +1,368 @@
+import asyncio
+import logging
+import multiprocessing as mp
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from playwright.async_api import async_playwright
+
+from scrapers.hh_scraper import HHParser
+from scrapers.habr_scraper import load_habr_page, extract_habr_page
+
+# Типы единиц работы, которые раздаются воркерам
+HH_SERP = "hh_serp"
+HH_RESUME = "hh_resume"
+HABR_PAGE = "habr_page"
+
+# Сколько раз задача повторяется, если воркер упал или завис на ней
+MAX_TASK_ATTEMPTS = 2
+
+# Сколько секунд ждать завершения воркера после terminate(), прежде чем kill()
+TERMINATE_GRACE = 5
+
+
+class ShardedCrawlError(Exception):
+    """Воркеры обхода падают чаще допустимого (например, не установлен Chromium)"""
+
+
+def _worker_main(worker_id, tasks, events, vacancy, city, headless):
+    """
+    Точка входа процесса-воркера: свой event loop и свой браузер.
+    events — собственный канал воркера, поэтому его аварийное завершение
+    не может повредить доставку событий от остальных.
+    """
+    try:
+        asyncio.run(
+            _worker_loop(worker_id, tasks, events, vacancy, city, headless)
+        )
+    finally:
+        events.close()
+
+
+async def _worker_loop(worker_id, tasks, events, vacancy, city, headless):
+    parser = HHParser(vacancy, city)
+    loop = asyncio.get_running_loop()
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        page = await browser.new_page()
+
+        try:
+            while True:
+                # Блокирующий get уводим в поток, чтобы не держать event loop
+                task = await loop.run_in_executor(None, tasks.get)
+                if task is None:
+                    break
+
+                kind, arg = task
+                try:
+                    if kind == HH_SERP:
+                        payload = await parser._collect_links(page, arg)
+                    elif kind == HH_RESUME:
+                        payload = await parser._visit_resume(page, arg)
+                    elif kind == HABR_PAGE:
+                        await load_habr_page(page, vacancy, arg)
+                        payload = await extract_habr_page(page, vacancy, arg)
+                    else:
+                        raise ValueError(f"Неизвестный тип задачи: {kind}")
+                    events.send(("done", worker_id, task, payload))
+                except Exception as e:
+                    events.send(("error", worker_id, task, str(e)))
+        finally:
+            await browser.close()
+
+
+class ShardedCrawl:
+    """
+    Координатор шардированного обхода.
+
+    Диапазоны страниц выдачи HH/Habr и ссылки на резюме раздаются воркерам
+    по одной задаче: как только воркер вернул результат, он получает
+    следующую, поэтому медленный шард не тормозит весь обход. Координатор
+    сам помнит, какая задача у какого воркера и когда она выдана: воркер,
+    который упал или держит задачу дольше task_timeout секунд, заменяется
+    новым, а задача повторяется. После max_respawns перезапусков обход
+    прерывается с ShardedCrawlError.
+    """
+
+    def __init__(
+        self,
+        vacancy,
+        city,
+        hh_pages=100,
+        habr_pages=50,
+        workers=4,
+        limit=None,
+        headless=True,
+        progress_callback=None,
+        result_callback=None,
+        max_respawns=None,
+        task_timeout=300,
+    ):
+        self.vacancy = vacancy
+        self.city = city
+        self.workers = workers
+        self.limit = limit
+        self.headless = headless
+        self.progress_callback = progress_callback
+        self.result_callback = result_callback
+        self.max_respawns = workers * 2 if max_respawns is None else max_respawns
+        self.task_timeout = task_timeout
+
+        # Ссылки на резюме приоритетнее новых страниц выдачи
+        self.resume_links = deque()
+        self.serp_pages = deque((HH_SERP, n) for n in range(hh_pages))
+        self.habr_pages = deque((HABR_PAGE, n) for n in range(1, habr_pages + 1))
+        self.retries = deque()
+
+        self.seen_links = set()
+        self.hh_results = []
+        self.habr_results = []
+        self.attempts = {}
+        self.respawns = 0
+
+        self._ctx = mp.get_context("spawn")
+        self._procs = {}
+        self._queues = {}
+        self._events = {}
+        self._assigned = {}
+        self._started = {}
+        self._idle = deque()
+        self._next_worker_id = 0
+
+    def _spawn_worker(self):
+        worker_id = self._next_worker_id
+        self._next_worker_id += 1
+        tasks = self._ctx.Queue()
+        events, child_events = self._ctx.Pipe(duplex=False)
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(
+                worker_id,
+                tasks,
+                child_events,
+                self.vacancy,
+                self.city,
+                self.headless,
+            ),
+            daemon=True,
+        )
+        proc.start()
+        # Копия канала на запись нужна только воркеру: когда он завершится,
+        # чтение вернёт EOF
+        child_events.close()
+        self._procs[worker_id] = proc
+        self._queues[worker_id] = tasks
+        self._events[worker_id] = events
+        self._idle.append(worker_id)
+
+    def _limit_reached(self):
+        # None и 0 — без лимита
+        return bool(self.limit) and len(self.hh_results) >= self.limit
+
+    def _next_task(self):
+        if self.retries:
+            return self.retries.popleft()
+        while self.resume_links:
+            task = self.resume_links.popleft()
+            if not self._limit_reached():
+                return task
+        if self.serp_pages and not self._limit_reached():
+            return self.serp_pages.popleft()
+        if self.habr_pages:
+            return self.habr_pages.popleft()
+        return None
+
+    def _dispatch(self):
+        while self._idle:
+            task = self._next_task()
+            if task is None:
+                break
+            worker_id = self._idle.popleft()
+            self._queues[worker_id].put(task)
+            self._assigned[worker_id] = task
+            self._started[worker_id] = time.monotonic()
+
+    def _drop_pages_after(self, pages, last):
+        for task in list(pages):
+            if task[1] > last:
+                pages.remove(task)
+
+    def _handle_result(self, task, payload):
+        kind, arg = task
+        if kind == HH_SERP:
+            if payload is None:
+                # Выдача закончилась — дальше страницы HH не раздаём
+                self._drop_pages_after(self.serp_pages, arg)
+                return
+            for link in payload:
+                if link not in self.seen_links:
+                    self.seen_links.add(link)
+                    self.resume_links.append((HH_RESUME, link))
+        elif kind == HH_RESUME:
+            if not self._limit_reached():
+                self.hh_results.append(payload)
+                if self.result_callback:
+                    self.result_callback("hh", payload)
+        elif kind == HABR_PAGE:
+            page_results, has_next = payload
+            self.habr_results.extend(page_results)
+            if self.result_callback:
+                for resume_data in page_results:
+                    self.result_callback("habr", resume_data)
+            if not has_next:
+                self._drop_pages_after(self.habr_pages, arg)
+
+    def _read_event(self, worker_id):
+        """Читает одно событие воркера; при EOF или обрыве канала закрывает его"""
+        events = self._events[worker_id]
+        try:
+            event, _, task, payload = events.recv()
+        except (EOFError, OSError):
+            events.close()
+            del self._events[worker_id]
+            return
+
+        if self._assigned.get(worker_id) != task:
+            # Событие от воркера, задачу которого уже переназначили
+            return
+
+        del self._assigned[worker_id]
+        self._started.pop(worker_id, None)
+        if worker_id in self._procs:
+            self._idle.append(worker_id)
+
+        if event == "done":
+            self._handle_result(task, payload)
+        else:
+            print(f"❌ Ошибка задачи {task}: {payload}")
+
+        if self.progress_callback:
+            self.progress_callback(len(self.hh_results), len(self.habr_results))
+
+    def _retry(self, task):
+        self.attempts[task] = self.attempts.get(task, 0) + 1
+        if self.attempts[task] < MAX_TASK_ATTEMPTS:
+            self.retries.append(task)
+        else:
+            print(f"❌ Задача {task} пропущена после повторной неудачи")
+
+    def _replace_worker(self, worker_id):
+        """Убирает воркер, возвращает его задачу в очередь и поднимает новый"""
+        proc = self._procs.pop(worker_id)
+        self._queues.pop(worker_id).close()
+        self._started.pop(worker_id, None)
+        if worker_id in self._idle:
+            self._idle.remove(worker_id)
+
+        events = self._events.pop(worker_id, None)
+        if events is not None:
+            events.close()
+
+        task = self._assigned.pop(worker_id, None)
+        if task is not None:
+            self._retry(task)
+
+        self.respawns += 1
+        if self.respawns > self.max_respawns:
+            raise ShardedCrawlError(
+                f"Воркеры обхода перезапущены {self.respawns} раз, обход прерван"
+            )
+        self._spawn_worker()
+        return proc
+
+    def _check_workers(self):
+        """Заменяет упавших и зависших воркеров, их задачи повторяются"""
+        now = time.monotonic()
+        for worker_id, proc in list(self._procs.items()):
+            if proc.is_alive():
+                started = self._started.get(worker_id)
+                if started is None or now - started < self.task_timeout:
+                    continue
+
+                logging.warning(
+                    f"Воркер {worker_id} не уложился в {self.task_timeout} с "
+                    f"на задаче {self._assigned.get(worker_id)}, завершаем"
+                )
+                proc.terminate()
+                proc.join(TERMINATE_GRACE)
+                if proc.is_alive():
+                    proc.kill()
+                    proc.join()
+            else:
+                # Результат, отправленный перед падением, ещё может быть в канале
+                events = self._events.get(worker_id)
+                while events is not None and events.poll():
+                    self._read_event(worker_id)
+                    events = self._events.get(worker_id)
+                logging.warning(
+                    f"Воркер {worker_id} упал (код {proc.exitcode}) "
+                    f"на задаче {self._assigned.get(worker_id)}"
+                )
+
+            self._replace_worker(worker_id)
+
+    def run(self):
+        logging.info(
+            f"Шардированный обход «{self.vacancy}» ({self.city}): "
+            f"воркеров {self.workers}"
+        )
+        for _ in range(self.workers):
+            self._spawn_worker()
+
+        try:
+            self._dispatch()
+            while self._assigned:
+                channels = {events: wid for wid, events in self._events.items()}
+                for events in wait(list(channels), timeout=1):
+                    self._read_event(channels[events])
+
+                # Упавшие и зависшие воркеры проверяются на каждой итерации,
+                # даже если остальные шарды непрерывно присылают результаты
+                self._check_workers()
+                self._dispatch()
+        finally:
+            for tasks in self._queues.values():
+                tasks.put(None)
+            for proc in self._procs.values():
+                proc.join(timeout=30)
+                if proc.is_alive():
+                    proc.terminate()
+            for events in self._events.values():
+                events.close()
+
+        results = self.hh_results + self.habr_results
+        logging.info(f"Шардированный обход завершен. Найдено: {len(results)}")
+        return len(results), results
+
+
+async def run_sharded_crawl(
+    vacancy,
+    city,
+    hh_pages=100,
+    habr_pages=50,
+    workers=4,
+    limit=None,
+    headless=True,
+    progress_callback=None,
+    result_callback=None,
+):
+    """
+    Асинхронная обёртка над ShardedCrawl: координатор работает в отдельном
+    потоке, чтобы не блокировать event loop вызывающего кода. Колбэки
+    синхронные и вызываются из этого потока.
+    """
+    crawl = ShardedCrawl(
+        vacancy,
+        city,
+        hh_pages=hh_pages,
+        habr_pages=habr_pages,
+        workers=workers,
+        limit=limit,
+        headless=headless,
+        progress_callback=progress_callback,
+        result_callback=result_callback,
+    )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, crawl.run)
@@ -5,7 +5,7 @@ from scrapers.hh_scraper import HHParser
 logging.basicConfig(level=logging.INFO)
 
 
-async def run_hh_parser(vacancy, city, progress_callback=None):
+async def run_hh_parser(vacancy, city, progress_callback=None, deadline=None):
     """
     Запускает парсер HH, получает данные и возвращает их напрямую.
     Больше не читает из временных файлов, так как HHParser возвращает всё в run().
@@ -16,7 +16,7 @@ async def run_hh_parser(vacancy, city, progress_callback=None):
 
     # parser.run возвращает кортеж: (количество, список_результатов)
     count, results = await parser.run(
-        limit_per_page=47, progress_callback=progress_callback
+        limit_per_page=47, progress_callback=progress_callback, deadline=deadline
     )
 
     logging.info(f"Парсинг завершен. Найдено: {count}")
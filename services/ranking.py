@@ -0,0 +1,173 @@
+import re
+import numpy as np
+
+from utils.skills import extract_skills
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Слова обрезаются до общей основы: "разработчик" и "разработчика"
+# дают один токен. Грубо, но без зависимостей от стеммеров.
+STEM_LENGTH = 6
+
+# Веса полей (упрощённый BM25F): заголовок важнее навыков, навыки — опыта
+FIELD_WEIGHTS = {"title": 3.0, "skills": 2.0, "experience": 1.0}
+
+
+def tokenize(text):
+    return [t[:STEM_LENGTH] for t in TOKEN_RE.findall(text.lower())]
+
+
+def query_pattern(words):
+    """
+    Регулярное выражение, находящее в тексте токены с основами из запроса.
+    Начало слова проверяет field_hits: без \b в начале шаблона движок
+    регулярных выражений ищет кандидатов по первым буквам альтернатив.
+    """
+    if not words:
+        return None
+    # Основа полной длины — префикс слова, короткое слово — целиком
+    alternatives = [
+        re.escape(w) + (r"\w*" if len(w) == STEM_LENGTH else r"(?!\w)")
+        for w in sorted(words, key=len, reverse=True)
+    ]
+    return re.compile("|".join(alternatives))
+
+
+def skill_tokens(skills):
+    # Префикс отделяет нормализованные навыки от обычных слов
+    return [f"skill:{skill}" for skill in sorted(skills)]
+
+
+def resume_fields(resume):
+    """Текст полей резюме HH или Habr Career для ранжирования"""
+    if "directions" in resume:
+        # Habr Career
+        title = " ".join(resume.get("directions") or [])
+        skills = " ".join(resume.get("skills") or [])
+        experience = " ".join(resume.get("work_experience") or [])
+    else:
+        # HeadHunter
+        blocks = resume.get("blocks") or {}
+        title = resume.get("title") or ""
+        skills = " ".join((blocks.get("skills") or {}).get("list") or [])
+        experience = (blocks.get("experience") or {}).get("raw") or ""
+    return {"title": title, "skills": skills, "experience": experience}
+
+
+def skills_pattern(skills):
+    """
+    Регулярное выражение для навыков из запроса в строке вида
+    "python;django\x00java;spring": навык совпадает только целиком
+    """
+    if not skills:
+        return None
+    alternatives = [re.escape(s) for s in sorted(skills, key=len, reverse=True)]
+    return re.compile(r"(?<![^;\x00])(?:" + "|".join(alternatives) + r")(?![^;\x00])")
+
+
+def field_hits(texts, pattern, term_of):
+    """
+    Вхождения pattern во все тексты поля за один проход регулярного
+    выражения: тексты склеиваются через "\x00", позиция совпадения
+    переводится в номер документа бинарным поиском по началам текстов.
+    Совпадения не с начала слова отбрасываются.
+    Возвращает (длины текстов в символах, документы, термины совпадений).
+    """
+    lengths = np.fromiter(map(len, texts), dtype=np.intp, count=len(texts))
+    if pattern is None:
+        return lengths, np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+
+    corpus = "\x00".join(texts)
+    positions, terms = [], []
+    for match in pattern.finditer(corpus):
+        start = match.start()
+        if start and (corpus[start - 1].isalnum() or corpus[start - 1] == "_"):
+            continue
+        positions.append(start)
+        terms.append(term_of(match.group()))
+
+    starts = np.concatenate(([0], np.cumsum(lengths[:-1] + 1)))
+    docs = np.searchsorted(starts, positions, side="right") - 1
+    return lengths, docs, np.asarray(terms, dtype=np.intp)
+
+
+def bm25_scores(query, resumes, k1=1.5, b=0.75):
+    """
+    BM25-оценки резюме относительно запроса.
+
+    Тексты каждого поля всех резюме склеиваются в один корпус, и из него
+    одним регулярным выражением извлекаются только вхождения терминов
+    запроса. Матрица частот "документ × термин запроса", idf,
+    нормализация по длине (в символах) и сумма по терминам считаются
+    операциями NumPy над всей выборкой. Навыки из skills_normalized
+    входят в поле навыков целыми токенами, поэтому "питон" в запросе
+    находит резюме с "python".
+    """
+    query_words = list(dict.fromkeys(tokenize(query)))
+    query_skills = sorted(extract_skills(query))
+    query_terms = query_words + skill_tokens(query_skills)
+    n_docs = len(resumes)
+    if not query_terms or not n_docs:
+        return np.zeros(n_docs)
+
+    n_terms = len(query_terms)
+    term_index = {term: i for i, term in enumerate(query_terms)}
+    word_re = query_pattern(query_words)
+
+    fields = [resume_fields(resume) for resume in resumes]
+    skills_texts = [
+        ";".join(resume.get("skills_normalized") or []) for resume in resumes
+    ]
+
+    tf = np.zeros((n_docs, n_terms))
+    doc_len = np.zeros(n_docs)
+    for field, weight in FIELD_WEIGHTS.items():
+        texts = [f[field].lower() for f in fields]
+        lengths, docs, terms = field_hits(
+            texts, word_re, lambda word: term_index[word[:STEM_LENGTH]]
+        )
+        if field == "skills":
+            skill_lengths, skill_docs, skill_terms = field_hits(
+                skills_texts,
+                skills_pattern(query_skills),
+                lambda skill: term_index[f"skill:{skill}"],
+            )
+            lengths = lengths + skill_lengths
+            docs = np.concatenate((docs, skill_docs))
+            terms = np.concatenate((terms, skill_terms))
+
+        # Частоты поля: число совпадений в каждой ячейке документ × термин
+        field_tf = np.bincount(docs * n_terms + terms, minlength=n_docs * n_terms)
+        tf += weight * field_tf.reshape(n_docs, n_terms)
+        doc_len += weight * lengths
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n_docs - df + 0.5) / (df + 0.5))
+
+    avg_len = doc_len.mean() or 1.0
+    norm = k1 * (1 - b + b * doc_len / avg_len)
+    return (tf * (k1 + 1) / (tf + norm[:, None]) * idf).sum(axis=1)
+
+
+def rank_resumes(query, resumes, top_k=None):
+    """
+    Сортирует резюме по релевантности запросу и добавляет поле `relevance`.
+    top_k ограничивает количество возвращаемых резюме.
+    """
+    if not resumes:
+        return []
+
+    scores = bm25_scores(query, resumes)
+    if top_k and top_k < len(resumes):
+        # argpartition отбирает top-K без полной сортировки
+        top = np.argpartition(-scores, top_k - 1)[:top_k]
+        order = top[np.argsort(-scores[top], kind="stable")]
+    else:
+        order = np.argsort(-scores, kind="stable")
+
+    ranked = []
+    for i in order:
+        resume = resumes[i]
+        resume["relevance"] = round(float(scores[i]), 4)
+        ranked.append(resume)
+    return ranked
@@ -0,0 +1,301 @@
+import asyncio
+import itertools
+import logging
+import multiprocessing as mp
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from services.search_service import run_search
+
+# Сколько секунд ждать завершения зависшего воркера после terminate()
+TERMINATE_GRACE = 5
+
+
+class ScrapeWorkerError(Exception):
+    """Задача поиска завершилась ошибкой или воркер упал во время её выполнения"""
+
+
+def _worker_main(worker_id, jobs, events, max_jobs):
+    """
+    Процесс-воркер: выполняет поиск по задачам из своей очереди.
+    После max_jobs задач завершается, чтобы супервизор поднял новый процесс
+    и память, накопленная Chromium, вернулась системе. events — собственный
+    канал воркера: если его убьют посреди записи, пострадает только он.
+    """
+    logging.basicConfig(level=logging.INFO)
+
+    try:
+        _run_jobs(worker_id, jobs, events, max_jobs)
+    finally:
+        events.close()
+
+
+def _run_jobs(worker_id, jobs, events, max_jobs):
+    for _ in range(max_jobs):
+        job = jobs.get()
+        if job is None:
+            return
+
+        job_id, vacancy, city, options = job
+
+        async def progress_callback(percent):
+            events.send(("progress", worker_id, job_id, percent))
+
+        try:
+            # (количество, резюме, partial) передаётся пулу как есть
+            result = asyncio.run(
+                run_search(
+                    vacancy, city, progress_callback=progress_callback, **options
+                )
+            )
+            events.send(("result", worker_id, job_id, result))
+        except Exception as e:
+            events.send(("error", worker_id, job_id, str(e)))
+
+
+class ScrapeWorkerPool:
+    """
+    Пул процессов-воркеров для парсинга.
+
+    Бот отправляет задачи через очереди воркеров и получает обратно
+    прогресс и результат по отдельному каналу от каждого воркера. Пул сам назначает задачу свободному воркеру и
+    помнит, какая задача у кого, поэтому зависание или падение браузера
+    затрагивает только воркер: супервизор перезапускает упавший процесс,
+    а его текущая задача завершается с ScrapeWorkerError. Воркер, который
+    держит задачу дольше job_timeout секунд, считается зависшим: он
+    останавливается (terminate, затем kill) и заменяется новым.
+    """
+
+    def __init__(self, workers=1, max_jobs_per_worker=20, job_timeout=None):
+        self.workers = workers
+        self.max_jobs_per_worker = max_jobs_per_worker
+        self.job_timeout = job_timeout
+
+        self._ctx = mp.get_context("spawn")
+        self._procs = {}
+        self._events = {}
+        self._queues = {}
+        self._assigned = {}
+        self._current = {}
+        self._started = {}
+        self._idle = deque()
+        self._backlog = deque()
+        self._pending = {}
+        self._job_ids = itertools.count(1)
+        self._worker_ids = itertools.count(1)
+        self._reader = None
+        self._supervisor = None
+        self._stopping = False
+
+    def _spawn_worker(self):
+        worker_id = next(self._worker_ids)
+        jobs = self._ctx.Queue()
+        events, child_events = self._ctx.Pipe(duplex=False)
+        proc = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, jobs, child_events, self.max_jobs_per_worker),
+            daemon=True,
+        )
+        proc.start()
+        # Копия канала на запись нужна только воркеру: после его завершения
+        # чтение вернёт EOF
+        child_events.close()
+        self._procs[worker_id] = proc
+        self._queues[worker_id] = jobs
+        self._events[worker_id] = events
+        self._assigned[worker_id] = 0
+        self._idle.append(worker_id)
+        logging.info(f"Запущен воркер парсинга {worker_id} (pid {proc.pid})")
+
+    def _dispatch(self):
+        moved = False
+        while self._idle and self._backlog:
+            worker_id = self._idle.popleft()
+            if worker_id not in self._procs:
+                continue
+
+            job = self._backlog.popleft()
+            self._queues[worker_id].put(job)
+            self._current[worker_id] = job[0]
+            self._started[worker_id] = time.monotonic()
+            self._assigned[worker_id] += 1
+            moved = True
+
+        if moved:
+            self._notify_queue()
+
+    def _notify_queue(self):
+        """Сообщает задачам из очереди их текущую позицию"""
+        for position, job in enumerate(self._backlog, start=1):
+            _, _, queue_callback = self._pending.get(job[0], (None, None, None))
+            if queue_callback:
+                asyncio.create_task(queue_callback(position))
+
+    async def start(self):
+        for _ in range(self.workers):
+            self._spawn_worker()
+        self._reader = asyncio.create_task(self._read_events())
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self):
+        self._supervisor.cancel()
+        self._stopping = True
+        for jobs in self._queues.values():
+            jobs.put(None)
+
+        loop = asyncio.get_running_loop()
+        for proc in self._procs.values():
+            await loop.run_in_executor(None, proc.join, 10)
+            if proc.is_alive():
+                await self._stop_process(proc)
+
+        # Читатель завершится, когда все каналы воркеров вернут EOF
+        await self._reader
+
+        for job_id in list(self._pending):
+            self._fail_job(job_id, "Пул воркеров остановлен")
+
+    async def submit(
+        self, vacancy, city, progress_callback=None, queue_callback=None, **options
+    ):
+        """
+        Отправляет задачу воркерам и ждёт (количество, список резюме, partial).
+        options передаются в run_search. Пока все воркеры заняты, задача
+        ждёт в очереди, а queue_callback(position) получает её позицию.
+        """
+        job_id = next(self._job_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[job_id] = (future, progress_callback, queue_callback)
+        self._backlog.append((job_id, vacancy, city, options))
+        self._dispatch()
+        if queue_callback and self._backlog and self._backlog[-1][0] == job_id:
+            await queue_callback(len(self._backlog))
+        try:
+            return await future
+        finally:
+            self._pending.pop(job_id, None)
+
+    def _fail_job(self, job_id, message):
+        future, _, _ = self._pending.get(job_id, (None, None, None))
+        if future is not None and not future.done():
+            future.set_exception(ScrapeWorkerError(message))
+
+    def _release_worker(self, worker_id):
+        self._current.pop(worker_id, None)
+        self._started.pop(worker_id, None)
+        # Воркер, отработавший лимит, сам завершится — новых задач не даём
+        if (
+            worker_id in self._procs
+            and self._assigned[worker_id] < self.max_jobs_per_worker
+        ):
+            self._idle.append(worker_id)
+        self._dispatch()
+
+    @staticmethod
+    def _poll_events(channels, timeout=0.5):
+        """
+        Ждёт события из каналов воркеров (выполняется в потоке).
+        Возвращает [(worker_id, событие)], событие None — канал закрыт.
+        """
+        by_conn = {conn: worker_id for worker_id, conn in channels.items()}
+        received = []
+        for conn in wait(list(by_conn), timeout):
+            try:
+                received.append((by_conn[conn], conn.recv()))
+            except Exception:
+                # EOF или сообщение, оборванное при остановке воркера
+                received.append((by_conn[conn], None))
+        return received
+
+    async def _read_events(self):
+        loop = asyncio.get_running_loop()
+        while not (self._stopping and not self._events):
+            # Каналы блокирующие — ждём их в потоке. Закрываются каналы только
+            # здесь, после EOF, поэтому результат последней задачи воркера,
+            # отработавшего лимит, не теряется
+            received = await loop.run_in_executor(
+                None, self._poll_events, dict(self._events)
+            )
+            for worker_id, event in received:
+                if event is None:
+                    self._events.pop(worker_id).close()
+                else:
+                    self._handle_event(event)
+
+    def _handle_event(self, event):
+        kind, worker_id, job_id, payload = event
+        future, progress_callback, _ = self._pending.get(job_id, (None, None, None))
+
+        if kind == "progress":
+            if progress_callback:
+                asyncio.create_task(progress_callback(payload))
+        elif kind == "result":
+            if future is not None and not future.done():
+                future.set_result(payload)
+            self._release_worker(worker_id)
+        elif kind == "error":
+            self._fail_job(job_id, payload)
+            self._release_worker(worker_id)
+
+    def _retire_worker(self, worker_id):
+        """Забывает воркер и поднимает вместо него новый"""
+        del self._procs[worker_id]
+        self._queues.pop(worker_id).close()
+        self._assigned.pop(worker_id)
+        self._started.pop(worker_id, None)
+        if worker_id in self._idle:
+            self._idle.remove(worker_id)
+
+        self._spawn_worker()
+        self._dispatch()
+
+    async def _stop_process(self, proc):
+        """terminate(), а если процесс не завершился за TERMINATE_GRACE — kill()"""
+        proc.terminate()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, proc.join, TERMINATE_GRACE)
+        if proc.is_alive():
+            proc.kill()
+            await loop.run_in_executor(None, proc.join)
+
+    def _kill_hung_workers(self):
+        if self.job_timeout is None:
+            return
+
+        now = time.monotonic()
+        for worker_id, started in list(self._started.items()):
+            if now - started < self.job_timeout:
+                continue
+
+            logging.warning(
+                f"Воркер {worker_id} не уложился в {self.job_timeout} с, завершаем"
+            )
+            job_id = self._current.pop(worker_id, None)
+            if job_id is not None:
+                self._fail_job(job_id, "Превышено время выполнения задачи")
+            # Замена запускается сразу, зависший процесс останавливается в фоне
+            proc = self._procs[worker_id]
+            self._retire_worker(worker_id)
+            asyncio.create_task(self._stop_process(proc))
+
+    async def _supervise(self):
+        while True:
+            await asyncio.sleep(1)
+            self._kill_hung_workers()
+            for worker_id, proc in list(self._procs.items()):
+                if proc.is_alive():
+                    continue
+
+                if proc.exitcode == 0:
+                    # Результат последней задачи может ещё лежать в канале воркера
+                    logging.info(f"Воркер {worker_id} отработал лимит задач")
+                else:
+                    logging.warning(
+                        f"Воркер {worker_id} упал (код {proc.exitcode})"
+                    )
+                    job_id = self._current.pop(worker_id, None)
+                    if job_id is not None:
+                        self._fail_job(job_id, "Воркер парсинга упал")
+
+                self._retire_worker(worker_id)
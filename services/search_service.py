@@ -0,0 +1,61 @@
+import logging
+from services.hh_service import run_hh_parser
+from scrapers.habr_scraper import parse_habr_resumes
+from services.ranking import rank_resumes
+from utils.deadline import Deadline
+
+# Доля бюджета времени, которую получает HH; Habr достаётся остаток,
+# включая время, не потраченное HH
+HH_BUDGET_SHARE = 0.7
+
+
+async def run_search(
+    vacancy, city, progress_callback=None, top_k=None, time_budget=None
+):
+    """
+    Полный сценарий поиска: HH, затем добор из Habr Career,
+    если резюме меньше 47. Объединённый список ранжируется по
+    релевантности вакансии, top_k оставляет только лучшие резюме.
+
+    time_budget — ограничение на весь поиск в секундах. Если оно
+    исчерпано, возвращается то, что успели собрать, с partial=True.
+    Возвращает (количество найденных, отранжированный список, partial).
+    """
+    deadline = Deadline(time_budget)
+
+    # 1. Запуск основного парсера (HH)
+    count, results = await run_hh_parser(
+        vacancy,
+        city,
+        progress_callback=progress_callback,
+        deadline=deadline.share(HH_BUDGET_SHARE),
+    )
+
+    # 2. Условие: если результатов меньше 47, добираем из Хабра
+    habr_skipped = False
+    if count < 47 and deadline.expired:
+        # На Habr времени не осталось — результат заведомо неполный
+        habr_skipped = True
+
+    elif count < 47:
+        logging.info(f"Мало данных ({count}), запускаем парсинг Habr...")
+
+        # Передаем vacancy как query. max_pages можно настроить
+        habr_results = await parse_habr_resumes(
+            query=vacancy, max_pages=3, deadline=deadline
+        )
+
+        if habr_results:
+            # Объединяем списки
+            results.extend(habr_results)
+            # Обновляем общее количество для отчета
+            count = len(results)
+
+    # 3. Ранжирование объединённого списка
+    results = rank_resumes(vacancy, results, top_k=top_k)
+
+    partial = deadline.exceeded or habr_skipped
+    if partial:
+        logging.info(f"Бюджет времени исчерпан, неполный результат: {count}")
+
+    return count, results, partial
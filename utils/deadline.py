@@ -0,0 +1,79 @@
+import asyncio
+import time
+
+
+class DeadlineExceeded(Exception):
+    """Бюджет времени поиска исчерпан"""
+
+
+class Deadline:
+    """
+    Бюджет времени задачи поиска.
+
+    Парсеры выполняют навигации через run(): операция отменяется, как только
+    бюджет исчерпан, и поднимается DeadlineExceeded. Флаг exceeded остаётся
+    выставленным, чтобы вызывающий код пометил результат как неполный.
+    seconds=None — без ограничения.
+    """
+
+    def __init__(self, seconds=None, parent=None):
+        self.parent = parent
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        if parent is not None and parent.expires_at is not None:
+            if self.expires_at is None or parent.expires_at < self.expires_at:
+                self.expires_at = parent.expires_at
+        self.exceeded = False
+
+    @property
+    def remaining(self):
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.expires_at is not None and self.remaining == 0
+
+    def share(self, fraction):
+        """Дочерний бюджет на долю оставшегося времени (для одного источника)"""
+        if self.expires_at is None:
+            return Deadline(parent=self)
+        return Deadline(self.remaining * fraction, parent=self)
+
+    def timeout_ms(self, default_ms):
+        """Таймаут Playwright, не выходящий за пределы бюджета"""
+        if self.expires_at is None:
+            return default_ms
+        return max(1, min(default_ms, int(self.remaining * 1000)))
+
+    def _mark_exceeded(self):
+        deadline = self
+        while deadline is not None:
+            deadline.exceeded = True
+            deadline = deadline.parent
+
+    async def run(self, awaitable):
+        """Выполняет операцию в пределах бюджета, по истечении — отменяет её"""
+        if self.expires_at is None:
+            return await awaitable
+
+        if self.expired:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            elif isinstance(awaitable, asyncio.Future):
+                awaitable.cancel()
+            self._mark_exceeded()
+            raise DeadlineExceeded()
+
+        try:
+            return await asyncio.wait_for(awaitable, self.remaining)
+        except asyncio.TimeoutError:
+            self._mark_exceeded()
+            raise DeadlineExceeded()
+
+
+async def run_within(deadline, awaitable):
+    """deadline.run(awaitable) или просто await, если бюджета нет"""
+    if deadline is None:
+        return await awaitable
+    return await deadline.run(awaitable)
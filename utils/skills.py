@@ -0,0 +1,252 @@
+from collections import deque
+
+# Каноническое название навыка -> синонимы (в нижнем регистре).
+# Каноническое название само тоже ищется в тексте.
+SKILL_TAXONOMY = {
+    "python": ["питон", "питона", "питоне", "питоном", "пайтон", "python3"],
+    "javascript": ["js", "джаваскрипт", "ecmascript", "es6"],
+    "typescript": ["ts"],
+    "java": ["джава"],
+    "kotlin": ["котлин"],
+    "c++": ["cpp", "си++"],
+    "c#": ["csharp", "си шарп"],
+    ".net": ["dotnet", "asp.net"],
+    "go": ["golang"],
+    "php": ["пхп"],
+    "ruby": ["ruby on rails", "rails"],
+    "rust": [],
+    "swift": [],
+    "1c": ["1с", "1с:предприятие"],
+    "sql": [],
+    "postgresql": ["postgres", "постгрес"],
+    "mysql": [],
+    "mongodb": ["mongo"],
+    "redis": [],
+    "clickhouse": [],
+    "kafka": [],
+    "rabbitmq": [],
+    "elasticsearch": ["elastic"],
+    "docker": ["докер", "докере", "докера"],
+    "kubernetes": ["k8s", "кубернетес"],
+    "linux": ["линукс"],
+    "git": [],
+    "nginx": [],
+    "ci/cd": ["gitlab ci", "jenkins"],
+    "aws": ["amazon web services"],
+    "django": ["джанго"],
+    "flask": [],
+    "fastapi": [],
+    "spring": ["spring boot"],
+    "react": ["reactjs", "react.js", "реакт"],
+    "vue": ["vuejs", "vue.js"],
+    "angular": [],
+    "node.js": ["nodejs", "node js"],
+    "html": ["html5"],
+    "css": ["css3", "scss", "sass"],
+    "graphql": [],
+    "rest api": ["rest", "restful"],
+    "pandas": [],
+    "numpy": [],
+    "machine learning": ["ml", "машинное обучение"],
+    "data science": [],
+    "airflow": [],
+    "spark": ["pyspark"],
+    "excel": ["эксель"],
+    "power bi": [],
+    "tableau": [],
+    "figma": ["фигма"],
+    "photoshop": ["фотошоп"],
+    "android": [],
+    "ios": [],
+    "unity": [],
+    "selenium": [],
+    "devops": [],
+    "qa": ["тестирование", "тестировщик"],
+}
+
+# Синонимы, которые в свободном тексте чаще означают обычное слово:
+# "go" — глагол, "rest" — отдых, "тестирование" — любая проверка и т.п.
+# В заголовке и блоке навыков они надёжны, в полном тексте резюме — нет.
+AMBIGUOUS_ALIASES = {
+    "go",
+    "ts",
+    "rest",
+    "spring",
+    "elastic",
+    "тестирование",
+    "ml",
+    "rails",
+}
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+class SkillMatcher:
+    """
+    Поиск навыков из таксономии автоматом Ахо-Корасик.
+
+    Автомат строится один раз и сразу разворачивается в полную таблицу
+    переходов, поэтому текст проходится за один линейный проход — один
+    поиск в словаре на символ, независимо от количества синонимов.
+    Совпадение засчитывается только по границам слов, чтобы "java"
+    не находилась внутри "javascript", а "js" внутри "json".
+    Шаблоны из exclude в автомат не добавляются.
+    """
+
+    def __init__(self, taxonomy=SKILL_TAXONOMY, exclude=()):
+        # goto[state] — переходы по символам, fail[state] — суффиксная ссылка,
+        # output[state] — (каноническое название, длина шаблона)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for canonical, synonyms in taxonomy.items():
+            for pattern in {canonical, *synonyms}:
+                if pattern not in exclude:
+                    self._add(pattern.lower(), canonical)
+        self._build_links()
+
+    def _add(self, pattern, canonical):
+        state = 0
+        for ch in pattern:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            state = next_state
+        self._output[state] += ((canonical, len(pattern)),)
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        order = []
+        while queue:
+            state = queue.popleft()
+            order.append(state)
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                link = self._goto[fallback].get(ch, 0)
+                self._fail[next_state] = link
+
+                # Совпадения по суффиксной ссылке наследуются заранее
+                self._output[next_state] += self._output[link]
+
+        # Полная таблица переходов: переходы по суффиксным ссылкам
+        # подставляются заранее, при поиске цикл по fail не нужен.
+        # Обход в порядке BFS: таблица для fail[state] к этому моменту готова.
+        self._delta = [None] * len(self._goto)
+        self._delta[0] = dict(self._goto[0])
+        for state in order:
+            transitions = dict(self._delta[self._fail[state]])
+            transitions.update(self._goto[state])
+            self._delta[state] = transitions
+
+    def _iter_matches(self, text):
+        """
+        (каноническое название, начало, конец) для совпадений в text.
+        Из пересекающихся совпадений остаётся самое длинное (левое при
+        равной длине): "js" внутри "node.js" не даёт лишний "javascript".
+        """
+        delta, output = self._delta, self._output
+        state = 0
+        last = len(text) - 1
+        matches = []
+
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if not output[state]:
+                continue
+
+            for canonical, length in output[state]:
+                start = i - length + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if i < last and _is_word_char(text[i + 1]):
+                    continue
+                matches.append((canonical, start, i + 1))
+
+        # Жадный выбор: по началу, при равном начале — сначала длинные
+        matches.sort(key=lambda m: (m[1], -m[2]))
+        covered_until = 0
+        for canonical, start, end in matches:
+            if start < covered_until:
+                continue
+            covered_until = end
+            yield canonical, start, end
+
+    def find(self, text):
+        """Множество канонических навыков, найденных в тексте"""
+        if not text:
+            return set()
+        return {canonical for canonical, _, _ in self._iter_matches(text.lower())}
+
+    def split(self, text):
+        """
+        Навыки из текста и оставшиеся слова (в нижнем регистре), не входящие
+        ни в одно совпадение: "python разработчик" -> ({"python"}, ["разработчик"])
+        """
+        if not text:
+            return set(), []
+
+        text = text.lower()
+        skills = set()
+        covered = [False] * len(text)
+        for canonical, start, end in self._iter_matches(text):
+            skills.add(canonical)
+            covered[start:end] = [True] * (end - start)
+
+        rest = "".join(" " if hit else ch for ch, hit in zip(text, covered))
+        # Разделители между навыками ("c++/python") словами не считаются
+        words = [w for w in rest.split() if any(_is_word_char(ch) for ch in w)]
+        return skills, words
+
+
+_default_matcher = None
+_text_matcher = None
+
+
+def get_skill_matcher():
+    """Общий автомат по SKILL_TAXONOMY, строится при первом обращении"""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = SkillMatcher()
+    return _default_matcher
+
+
+def get_text_skill_matcher():
+    """Автомат для свободного текста — без AMBIGUOUS_ALIASES"""
+    global _text_matcher
+    if _text_matcher is None:
+        _text_matcher = SkillMatcher(exclude=AMBIGUOUS_ALIASES)
+    return _text_matcher
+
+
+def extract_skills(*texts):
+    """Нормализованный набор навыков из нескольких текстов (None пропускаются)"""
+    matcher = get_skill_matcher()
+    skills = set()
+    for text in texts:
+        if text:
+            skills |= matcher.find(text)
+    return skills
+
+
+def extract_text_skills(*texts):
+    """
+    Навыки из свободного текста (полный текст резюме, описание опыта):
+    неоднозначные синонимы из AMBIGUOUS_ALIASES не учитываются
+    """
+    matcher = get_text_skill_matcher()
+    skills = set()
+    for text in texts:
+        if text:
+            skills |= matcher.find(text)
+    return skills